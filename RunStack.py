@@ -7,12 +7,56 @@
 #############################
 
 import os
+import re
 import sys
-import glob
+import logging
 import argparse
 import subprocess
 from pathlib import Path
+from logging.handlers import RotatingFileHandler
 from multiprocessing import cpu_count
+from concurrent.futures import ThreadPoolExecutor
+
+# cpu_count() reads sysconf on every call; sample it once at import
+_CPU_COUNT = cpu_count()
+_DEFAULT_CORES = min(max(_CPU_COUNT // 2, 1), 8)
+
+
+# Steps of the standard 16-step ISCE2 TOPS stack that are independent
+# of each other and safe to launch at the same time; every step not
+# listed here runs alone in its normal position. Only steps 03 and 04
+# qualify (both consume just the outputs of steps 01-02); the later
+# steps form producer/consumer chains, e.g. 06 overlap_resample reads
+# the 05 overlap_geo2rdr offsets and 09 fullBurst_geo2rdr reads the
+# 08 timeseries_misreg estimates
+PARALLEL_STEP_GROUPS = [[3, 4]]
+
+
+def build_step_groups(expected_files, parallel_steps=False):
+    """
+    Build the ordered list of step groups to execute
+
+    Args:
+        expected_files (int): Total number of run files
+        parallel_steps (bool): Group independent steps together;
+            when False every step runs alone in order
+
+    Returns:
+        list: Lists of step indices; each inner list runs concurrently
+    """
+    if not parallel_steps:
+        return [[i] for i in range(1, expected_files + 1)]
+
+    head = {g[0]: g for g in PARALLEL_STEP_GROUPS}
+    groups = []
+    grouped = set()
+    for i in range(1, expected_files + 1):
+        if i in grouped:
+            continue
+        group = [j for j in head.get(i, [i]) if j <= expected_files]
+        groups.append(group)
+        grouped.update(group)
+    return groups
 
 
 def find_run_files(run_files_dir):
@@ -33,31 +77,37 @@ def find_run_files(run_files_dir):
     if not run_path.is_dir():
         raise NotADirectoryError(f"Path is not a directory: {run_files_dir}")
     
-    # Find all run_* files
-    run_files = list(run_path.glob('run_*'))
-    
+    # Find all run_* files; a literal-prefix scandir filter avoids
+    # compiling a glob pattern and the Path allocations
+    with os.scandir(run_files_dir) as it:
+        run_files = [entry.path for entry in it
+                     if entry.name.startswith('run_')]
+
     if not run_files:
         raise FileNotFoundError(f"No run_* files found in {run_files_dir}")
-    
-    return sorted([str(f) for f in run_files])
+
+    return sorted(run_files)
 
 
-def run_stack_processing(run_files_dir, cores=None, expected_files=16):
+def run_stack_processing(run_files_dir, cores=None, expected_files=16,
+                         parallel_steps=False):
     """
     Execute ISCE2 stack processing runfiles using run.py
-    
+
     Args:
         run_files_dir (str): Directory containing run files
         cores (int): Number of CPU cores to use
         expected_files (int): Expected number of run files
-        
+        parallel_steps (bool): Launch independent steps concurrently;
+            default is the strictly serial order
+
     Returns:
         bool: True if all files processed successfully
     """
     
     # Auto-detect cores if not specified
     if cores is None:
-        cores = min(max(cpu_count() // 2, 1), 8)
+        cores = _DEFAULT_CORES
     
     print(f"Stack processing parameters:")
     print(f"  Run files directory: {run_files_dir}")
@@ -86,41 +136,61 @@ def run_stack_processing(run_files_dir, cores=None, expected_files=16):
     
     success_count = 0
     total_files = len(scripts)
-    
-    # Process each run file
-    for i in range(1, expected_files + 1):
-        # Find matching script for current step
-        matched_scripts = [s for s in scripts if f'run_{i:02d}' in os.path.basename(s)]
-        
-        if not matched_scripts:
+
+    # Map step index -> script once instead of rescanning the whole
+    # scripts list for every step
+    step_pattern = re.compile(r'run_(\d+)')
+    script_by_step = {}
+    for s in scripts:
+        m = step_pattern.search(os.path.basename(s))
+        if m:
+            script_by_step.setdefault(int(m.group(1)), s)
+
+    def run_step(i, step_cores):
+        """Run one step; True on success, False on error, None if missing"""
+        script = script_by_step.get(i)
+
+        if script is None:
             print(f"WARNING: run_{i:02d} script not found, skipping")
-            continue
-        
-        script = matched_scripts[0]
+            return None
         script_name = os.path.basename(script)
         log_file = logs_dir / f"log_run{i:02d}.log"
-        
-        print(f"\n{'='*60}")
-        print(f"Step {i:02d}/{expected_files}: Processing {script_name}")
-        print(f"{'='*60}")
-        
+
         # Build command
-        cmd = ["run.py", "--input", script, "-p", str(cores)]
-        
+        cmd = ["run.py", "--input", script, "-p", str(step_cores)]
+
+        # Line-buffered pipe into a size-capped rotating log: progress
+        # is visible while the step runs (run.py block-buffers when
+        # writing straight to a file) and the interferogram-formation
+        # steps can no longer grow the log without bound
+        handler = RotatingFileHandler(log_file, mode='w',
+                                      maxBytes=64 << 20, backupCount=2)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger = logging.getLogger(f'RunStack.run_{i:02d}')
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+
         try:
-            with open(log_file, "w") as f:
-                result = subprocess.run(
-                    cmd, 
-                    stdout=f, 
-                    stderr=subprocess.STDOUT, 
-                    check=True,
-                    cwd=run_files_dir
-                )
-            
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=1,
+                text=True,
+                cwd=run_files_dir
+            )
+            with proc.stdout:
+                for line in proc.stdout:
+                    logger.info(line.rstrip('\n'))
+            returncode = proc.wait()
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, cmd)
+
             print(f"✓ {script_name} completed successfully")
             print(f"  Log saved to: {log_file}")
-            success_count += 1
-            
+            return True
+
         except subprocess.CalledProcessError as e:
             print(f"✗ ERROR: {script_name} execution failed (return code: {e.returncode})")
             print(f"  Check log file for details: {log_file}")
@@ -131,6 +201,32 @@ def run_stack_processing(run_files_dir, cores=None, expected_files=16):
         except Exception as e:
             print(f"✗ ERROR: Unexpected error processing {script_name}: {str(e)}")
             return False
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+    # Process the run files group by group; steps inside a group are
+    # independent and launched together, the cores are split between them
+    for group in build_step_groups(expected_files, parallel_steps):
+        steps = ' + '.join(f'run_{i:02d}' for i in group)
+        print(f"\n{'='*60}")
+        print(f"Step group [{steps}] of {expected_files} steps")
+        print(f"{'='*60}")
+
+        step_cores = max(cores // len(group), 1)
+        if len(group) == 1:
+            results = [run_step(group[0], step_cores)]
+        else:
+            with ThreadPoolExecutor(max_workers=len(group)) as executor:
+                results = list(executor.map(
+                    lambda i: run_step(i, step_cores), group
+                ))
+
+        for result in results:
+            if result is True:
+                success_count += 1
+            elif result is False:
+                return False
     
     print(f"\n{'='*60}")
     print(f"Processing Summary:")
@@ -139,7 +235,7 @@ def run_stack_processing(run_files_dir, cores=None, expected_files=16):
     print(f"  Logs directory: {logs_dir}")
     print(f"{'='*60}")
     
-    return success_count == len([s for s in scripts if any(f'run_{i:02d}' in os.path.basename(s) for i in range(1, expected_files + 1))])
+    return success_count == total_files
 
 
 def create_parser():
@@ -154,6 +250,9 @@ def create_parser():
                        help='Number of CPU cores to use (default: auto-detect)')
     parser.add_argument('--expected-files', type=int, default=16,
                        help='Expected number of run files (default: 16)')
+    parser.add_argument('--parallel-steps', action='store_true',
+                       help='Launch independent steps concurrently '
+                            '(default: strictly serial order)')
     
     return parser
 
@@ -164,9 +263,10 @@ if __name__ == "__main__":
     
     # Run stack processing
     success = run_stack_processing(
-        args.run_files_dir, 
-        args.cores, 
-        args.expected_files
+        args.run_files_dir,
+        args.cores,
+        args.expected_files,
+        args.parallel_steps
     )
     
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -31,16 +31,21 @@ def find_dem_file(dem_dir):
     if not dem_path.is_dir():
         raise NotADirectoryError(f"Path is not a directory: {dem_dir}")
     
-    # Look for files ending with 'wgs84'
-    dem_files = list(dem_path.glob('*wgs84'))
-    
+    # Look for files ending with 'wgs84'; a literal-suffix scandir
+    # filter avoids compiling a glob pattern and the Path allocations
+    with os.scandir(dem_dir) as it:
+        dem_files = sorted(
+            entry.path for entry in it
+            if entry.name.endswith('wgs84') and entry.is_file()
+        )
+
     if not dem_files:
         raise FileNotFoundError(f"No DEM file ending with 'wgs84' found in {dem_dir}")
-    
+
     if len(dem_files) > 1:
-        print(f"Warning: Multiple DEM files found, using: {dem_files[0].name}")
-    
-    return str(dem_files[0])
+        print(f"Warning: Multiple DEM files found, using: {os.path.basename(dem_files[0])}")
+
+    return dem_files[0]
 
 
 def stack_sentinel(lat_min, lat_max, lon_min, lon_max, 
@@ -94,28 +99,29 @@ def stack_sentinel(lat_min, lat_max, lon_min, lon_max,
     print(f"  Range looks: {nrlks}")
     print(f"  Process directory: {process_dir}")
     print(f"Running command: {' '.join(cmd)}\n")
-    
+
+    # Stream stdout/stderr straight to a log file like RunStack does,
+    # instead of buffering the whole output in memory with
+    # capture_output; the log can be tailed while the run is going
+    log_file = process_path / 'stackSentinel.log'
+
     try:
-        result = subprocess.run(
-            cmd,
-            cwd=process_dir,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        
+        with open(log_file, 'w') as log_f:
+            result = subprocess.run(
+                cmd,
+                cwd=process_dir,
+                check=True,
+                stdout=log_f,
+                stderr=subprocess.STDOUT
+            )
+
         print("Stack Sentinel completed successfully!")
-        if result.stdout:
-            print("Output:")
-            print(result.stdout)
+        print(f"Log saved to: {log_file}")
         return True
-        
+
     except subprocess.CalledProcessError as e:
         print(f"ERROR: stackSentinel.py failed with return code {e.returncode}")
-        if e.stdout:
-            print("Stdout:", e.stdout)
-        if e.stderr:
-            print("Stderr:", e.stderr)
+        print(f"Check log file for details: {log_file}")
         return False
     except FileNotFoundError:
         print("ERROR: stackSentinel.py not found. Please ensure ISCE2 is installed and in PATH.")
@@ -6,7 +6,6 @@
 # sunny day in Beijing at 01/09/2025
 #############################
 
-import os
 import sys
 import argparse
 import subprocess
@@ -25,10 +24,11 @@ def download_S1_SLC_dem(lat_min, lat_max, lon_min, lon_max, dem_dir):
         dem_dir (str): Output directory for DEM files
     """
     
-    # Create DEM folder
+    # Create DEM folder; dem.py runs with cwd= below, so the caller's
+    # working directory is never touched and several AOIs can be
+    # processed concurrently from one process
     dem_path = Path(dem_dir)
     dem_path.mkdir(parents=True, exist_ok=True)
-    os.chdir(dem_path)
     # Calculate extended boundaries (add 1 degree buffer)
     lat_min_dem = int(float(lat_min)) - 1
     lat_max_dem = int(float(lat_max)) + 1
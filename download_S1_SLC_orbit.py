@@ -7,19 +7,35 @@
 #############################
 
 import os
+import re
 import sys
-import glob
+import asyncio
 import requests
 import argparse
 from datetime import datetime, timedelta
 from multiprocessing import cpu_count
-from joblib import Parallel, delayed
+from concurrent.futures import ThreadPoolExecutor
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-global ORBIT_URL 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# cpu_count() reads sysconf on every call; sample it once at import
+_CPU_COUNT = cpu_count()
+_DEFAULT_JOBS = min(max(_CPU_COUNT // 4, 2), 8)
+
+global ORBIT_URL
 ORBIT_URL = "https://s1qc.asf.alaska.edu/aux_poeorb/"
 
+# The validity window is embedded in the orbit filename:
+# S1A_OPER_AUX_POEORB_OPOD_<prod>T<hms>_V<prev>T<hms>_<next>T<hms>.EOF
+_ORBIT_RE = re.compile(
+    r'href="(S1[AB]_OPER_AUX_POEORB_OPOD_\d{8}T\d{6}'
+    r'_V(\d{8})T\d{6}_(\d{8})T\d{6}\.EOF)"')
+
 def create_session():
     """
     Create requests session to connect the poeorb
@@ -31,29 +47,113 @@ def create_session():
         status_forcelist=[500, 502, 503, 504],
         allowed_methods=["GET"]
     )
-    session.mount("https://", HTTPAdapter(max_retries=retries))
+    # Pool enough connections for every download worker so the TLS
+    # session is reused across files instead of re-handshaking
+    session.mount("https://", HTTPAdapter(
+        max_retries=retries, pool_connections=8, pool_maxsize=8))
     session.headers.update({"User-Agent": "Mozilla/5.0"})
     return session
 
 
+def _already_downloaded(save_path):
+    """
+    check whether an orbit file is already on disk
+    Orbit EOFs are immutable once published, so a non-trivial local
+    copy never needs re-downloading
+    Args:
+        save_path (str): local path of the orbit file
+    Returns:
+        bool: True if the file exists with a plausible size
+    """
+    try:
+        return os.path.getsize(save_path) > 100_000
+    except OSError:
+        return False
+
+
 def download_file(session, task):
     """
-    download the orbit files 
+    download the orbit files
     Args:
         session (requests.session): the session between user and net
-        task (list): the task of download files 
+        task (list): the task of download files
     """
     file_url, save_path = task
+    if _already_downloaded(save_path):
+        print(f"Already exists: {os.path.basename(save_path)}, skipping...")
+        return
+    # Download to a temporary name and rename on success, so a dead
+    # transfer can never leave a truncated file at save_path
+    part_path = save_path + '.part'
     try:
         with session.get(file_url, stream=True, timeout=666) as r:
             r.raise_for_status()
-            with open(save_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
+            # 1 MiB chunks: a few write calls per orbit file instead
+            # of hundreds of 8 KiB round-trips
+            with open(part_path, 'wb', buffering=1 << 20) as f:
+                for chunk in r.iter_content(chunk_size=1 << 20):
                     if chunk:
                         f.write(chunk)
+        os.replace(part_path, save_path)
+        print(f"Downloaded: {os.path.basename(save_path)}")
+    except Exception as e:
+        print(f"Failed to download {file_url}: {e}")
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+
+async def _fetch(session, sem, task):
+    """
+    download one orbit file over the shared aiohttp session
+    Args:
+        session (aiohttp.ClientSession): the shared session
+        sem (asyncio.Semaphore): cap on concurrent requests
+        task (tuple): (file_url, save_path) of the orbit file
+    """
+    file_url, save_path = task
+    if _already_downloaded(save_path):
+        print(f"Already exists: {os.path.basename(save_path)}, skipping...")
+        return
+    # Download to a temporary name and rename on success, so a dead
+    # transfer can never leave a truncated file at save_path
+    part_path = save_path + '.part'
+    try:
+        async with sem:
+            async with session.get(file_url) as r:
+                r.raise_for_status()
+                # File I/O is blocking; push it to a worker thread so
+                # a slow disk never stalls the other transfers on the
+                # event loop
+                f = await asyncio.to_thread(
+                    open, part_path, 'wb', buffering=1 << 20)
+                try:
+                    async for chunk in r.content.iter_chunked(1 << 20):
+                        await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
+        os.replace(part_path, save_path)
         print(f"Downloaded: {os.path.basename(save_path)}")
     except Exception as e:
         print(f"Failed to download {file_url}: {e}")
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+
+async def _download_all_async(download_tasks):
+    """
+    download all orbit files concurrently with one aiohttp session
+    Args:
+        download_tasks (list): list of (file_url, save_path) tuples
+    """
+    sem = asyncio.Semaphore(16)
+    connector = aiohttp.TCPConnector(limit=16, limit_per_host=16)
+    timeout = aiohttp.ClientTimeout(total=600)
+    async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout,
+            headers={"User-Agent": "Mozilla/5.0"}) as session:
+        await asyncio.gather(*(
+            _fetch(session, sem, task) for task in download_tasks
+        ))
 
 
 def downloda_S1_SLC_orbit_list(zipped_dir, orbits_dir):
@@ -65,11 +165,27 @@ def downloda_S1_SLC_orbit_list(zipped_dir, orbits_dir):
     """
     # get the zipped file list
     session = create_session()
-    resp = session.get(ORBIT_URL, timeout=666).content
-    lst = [str(i[:77])[2:-1] for i in resp.split(b'href="')]
+    # Decode the index page once and scan it with one compiled regex;
+    # the two capture groups are the validity window dates of each
+    # orbit file
+    text = session.get(ORBIT_URL, timeout=666).content.decode(
+        'ascii', errors='ignore')
+    # Hash-join: index the orbit list by mission and (prev_date,
+    # next_date) validity window once, then each zip is a single O(1)
+    # lookup instead of a scan over every orbit filename. The mission
+    # must be part of the key: S1A and S1B orbits for the same date
+    # share the same validity window
+    orbit_index = {
+        (name[:3], prev, nxt): name
+        for name, prev, nxt in _ORBIT_RE.findall(text)
+    }
     download_tasks = []
-    S1A_dir = os.path.join(zipped_dir, 'S1A*.zip')
-    for file in glob.glob(S1A_dir):
+    with os.scandir(zipped_dir) as it:
+        zip_names = sorted(
+            entry.name for entry in it
+            if entry.name.startswith('S1A') and entry.name.endswith('.zip')
+        )
+    for file in zip_names:
         date_str = file.split('_')[-5][:8]
         y, m, d = int(date_str[:4]),  int(date_str[4:6]),  int(date_str[6:8])
         dt = datetime(y, m, d)
@@ -77,19 +193,28 @@ def downloda_S1_SLC_orbit_list(zipped_dir, orbits_dir):
         next_dt = dt + timedelta(days=1)
         prev_dt_str = f'{prev_dt.year}{prev_dt.month:02d}{prev_dt.day:02d}'
         next_dt_str = f'{next_dt.year}{next_dt.month:02d}{next_dt.day:02d}'
-        for filename in lst:
-            if (filename[-35:-27] == prev_dt_str) & (filename[-19:-11] == next_dt_str):
-                download_tasks.append((
-                    f"{ORBIT_URL}{filename}",
-                    os.path.join(orbits_dir, filename)
-                                    ))
-                          
-    njobs = min(max(cpu_count() // 4, 2), 8)
-    print(f"Starting parallel download with {njobs} jobs...")
-    Parallel(n_jobs=njobs)(
-        delayed(download_file)(session, task) for task in download_tasks
-    )
-    
+        filename = orbit_index.get((file[:3], prev_dt_str, next_dt_str))
+        if filename is not None:
+            download_tasks.append((
+                f"{ORBIT_URL}{filename}",
+                os.path.join(orbits_dir, filename)
+                                ))
+
+    # One event loop overlaps TLS handshakes and transfers across all
+    # files; fall back to the blocking path if aiohttp is not installed
+    if aiohttp is not None:
+        print(f"Starting async download of {len(download_tasks)} files...")
+        asyncio.run(_download_all_async(download_tasks))
+    else:
+        njobs = _DEFAULT_JOBS
+        print(f"Starting parallel download with {njobs} jobs...")
+        # Threads share the one session (and its connection pool) and
+        # skip the fork/pickle cost of worker processes entirely
+        with ThreadPoolExecutor(max_workers=njobs) as executor:
+            list(executor.map(
+                lambda task: download_file(session, task), download_tasks
+            ))
+
     print("All downloads finished.")
 
 